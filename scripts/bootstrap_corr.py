@@ -0,0 +1,127 @@
+# scripts/bootstrap_corr.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# ---- paths ----
+proc_dir = "data/processed"
+out_path = "outputs/bootstrap_corr_ci.csv"
+
+N_BOOT = 2000
+BATCH = 500
+SEED = 42
+ALPHA = 0.05
+MIN_N = 5
+
+
+def _rowwise_pearson(xs, ys):
+    """Pearson r for each row of two (batch, n) matrices."""
+    xc = xs - xs.mean(axis=1, keepdims=True)
+    yc = ys - ys.mean(axis=1, keepdims=True)
+    num = np.einsum('ij,ij->i', xc, yc)
+    den = np.sqrt(np.einsum('ij,ij->i', xc, xc) * np.einsum('ij,ij->i', yc, yc))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return num / den
+
+
+def _percentile_ci(samples, q):
+    """Percentile bounds ignoring NaN resamples; NaN bounds if every resample is NaN."""
+    if np.isnan(samples).all():
+        return np.nan, np.nan
+    return tuple(np.nanpercentile(samples, q))
+
+
+def bootstrap_corr(x, y, n_boot=N_BOOT, batch=BATCH, seed=SEED, alpha=ALPHA):
+    """
+    Percentile bootstrap CIs for Pearson and Spearman correlation of x and y.
+    :param x, y: 1-D arrays of equal length without NaNs
+    :param seed: int or np.random.SeedSequence; same seed -> same intervals
+    :return: dict with point estimates and (lo, hi) bounds, or None if n < MIN_N
+    Resample indices are drawn batch x n at a time and correlations are computed as
+    matrix reductions. Spearman uses ranks taken once on the full sample, so each
+    resample is a Pearson correlation of pre-ranked values.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n < MIN_N:
+        return None
+    rx = stats.rankdata(x)
+    ry = stats.rankdata(y)
+
+    rng = np.random.default_rng(seed)
+    pear = np.empty(n_boot)
+    spear = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        b = min(batch, n_boot - start)
+        idx = rng.integers(0, n, size=(b, n))
+        pear[start:start + b] = _rowwise_pearson(x[idx], y[idx])
+        spear[start:start + b] = _rowwise_pearson(rx[idx], ry[idx])
+
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    # a constant x or y (e.g. all-zero cases) makes every resample NaN
+    pear_lo, pear_hi = _percentile_ci(pear, q)
+    spear_lo, spear_hi = _percentile_ci(spear, q)
+    return {
+        'n': n,
+        'pearson_r': _rowwise_pearson(x[None, :], y[None, :])[0],
+        'pearson_lo': pear_lo, 'pearson_hi': pear_hi,
+        'spearman_r': _rowwise_pearson(rx[None, :], ry[None, :])[0],
+        'spearman_lo': spear_lo, 'spearman_hi': spear_hi,
+    }
+
+
+def _run_group(args):
+    key, x, y, seed, n_boot, batch, alpha = args
+    res = bootstrap_corr(x, y, n_boot=n_boot, batch=batch, seed=seed, alpha=alpha)
+    if res is None:
+        return None
+    return {**key, **res}
+
+
+def bootstrap_groups(df, by, x, y, n_boot=N_BOOT, batch=BATCH, seed=SEED, alpha=ALPHA, max_workers=None):
+    """
+    Bootstrap CIs of corr(x, y) for every group of df across a process pool.
+    :param by: list of grouping columns, e.g. ['disease', 'who_region']
+    :return: DataFrame with one row per group that has at least MIN_N complete pairs
+    Each group gets its own child of SeedSequence(seed), in sorted group order, so
+    results do not depend on worker count or scheduling.
+    """
+    data = df[by + [x, y]].dropna()
+    groups = list(data.groupby(by, sort=True))
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+    tasks = []
+    for (key, g), s in zip(groups, seeds):
+        key = key if isinstance(key, tuple) else (key,)
+        tasks.append((dict(zip(by, key)), g[x].to_numpy(), g[y].to_numpy(), s, n_boot, batch, alpha))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = [r for r in pool.map(_run_group, tasks, chunksize=8) if r is not None]
+    return pd.DataFrame(results, columns=by + ['n', 'pearson_r', 'pearson_lo', 'pearson_hi',
+                                               'spearman_r', 'spearman_lo', 'spearman_hi'])
+
+
+if __name__ == "__main__":
+    coverage = pd.read_csv(os.path.join(proc_dir, "coverage.csv"))
+    reported = pd.read_csv(os.path.join(proc_dir, "reported_cases.csv"))
+    schedule = pd.read_csv(os.path.join(proc_dir, "vaccine_schedule.csv"))
+    for df in (coverage, reported, schedule):
+        df.columns = [c.lower() for c in df.columns]
+
+    # country-year coverage against per-disease reported cases, tagged with WHO region
+    cov_agg = coverage.groupby(['code', 'year'], as_index=False).agg(avg_coverage=('coverage', 'mean'))
+    reported['cases'] = pd.to_numeric(reported['cases'], errors='coerce')
+    reported = reported[reported['cases'] >= 0]
+    regions = schedule[['iso_3_code', 'who_region']].drop_duplicates('iso_3_code').rename(columns={'iso_3_code': 'code'})
+    pairs = reported.merge(cov_agg, on=['code', 'year'], how='inner').merge(regions, on='code', how='left')
+
+    by_disease = bootstrap_groups(pairs, ['disease'], 'avg_coverage', 'cases')
+    by_region = bootstrap_groups(pairs, ['disease', 'who_region'], 'avg_coverage', 'cases')
+    by_disease.insert(1, 'who_region', 'ALL')
+    result = pd.concat([by_disease, by_region], ignore_index=True)
+
+    os.makedirs("outputs", exist_ok=True)
+    result.to_csv(out_path, index=False)
+    print(f"Bootstrap CIs ({N_BOOT} resamples, seed={SEED}) for {len(result)} groups saved to:", out_path)
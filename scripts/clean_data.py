@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+import re
 
 # Paths
 raw_path = "data/raw/"
@@ -12,6 +13,52 @@ def clean_year(df):
     df["YEAR"] = df["YEAR"].astype(int)
     return df
 
+# Denominators look like "per 1,000,000 total population"; the base is the number after "per"
+DENOM_PATTERN = re.compile(r"^per\s+([\d,]+)\s+(.+)$", re.IGNORECASE)
+KNOWN_POPULATIONS = {"total population", "<15 population", "live births"}
+
+def build_denominator_lookup(denominators):
+    """
+    Parse each distinct denominator string once into its numeric base and population.
+    :param denominators: iterable of denominator strings (NaN ignored)
+    :return: DataFrame indexed by denominator string with denom_base (float) and
+             denominator_population (e.g. "live births")
+    Raises ValueError listing every denominator that cannot be parsed or validated.
+    """
+    lookup, unknown = {}, []
+    for d in pd.unique(pd.Series(denominators).dropna()):
+        m = DENOM_PATTERN.match(str(d).strip())
+        if not m:
+            unknown.append(d)
+            continue
+        base = int(m.group(1).replace(",", ""))
+        population = m.group(2).strip().lower()
+        if base <= 0 or population not in KNOWN_POPULATIONS:
+            unknown.append(d)
+            continue
+        lookup[d] = (float(base), population)
+    if unknown:
+        raise ValueError(f"Unknown incidence denominators: {unknown}")
+    return pd.DataFrame.from_dict(lookup, orient="index", columns=["denom_base", "denominator_population"])
+
+def normalize_incidence(df):
+    """
+    Add incidence_per_100k and its denominator_population using a per-denominator
+    lookup applied as a categorical mapping. Rates are only comparable within the
+    same denominator_population (per 100k live births vs. per 100k population).
+    """
+    rate = pd.to_numeric(df["incidence_rate"], errors="coerce")
+    denom = df["denominator"].astype("category")
+    lookup = build_denominator_lookup(denom.cat.categories)
+    base = denom.map(lookup["denom_base"]).astype(float)
+    missing = base.isna() & rate.notna()
+    if missing.any():
+        raise ValueError(f"{int(missing.sum())} incidence rows have a rate but no denominator")
+    df["incidence_rate"] = rate
+    df["incidence_per_100k"] = rate * (100000.0 / base)
+    df["denominator_population"] = denom.map(lookup["denominator_population"]).astype(object)
+    return df
+
 # --- Coverage Data ---
 coverage = pd.read_excel(raw_path + "coverage.xlsx")
 coverage = coverage.drop(columns=["GROUP"])
@@ -24,6 +71,7 @@ incidence = pd.read_excel(raw_path + "incidence.xlsx")
 incidence = incidence.drop(columns=["GROUP"])
 incidence = clean_year(incidence)
 incidence.columns = incidence.columns.str.lower()
+incidence = normalize_incidence(incidence)
 incidence.to_csv(processed_path + "incidence.csv", index=False)
 
 # --- Reported Cases ---
@@ -47,4 +95,4 @@ schedule = clean_year(schedule)
 schedule.columns = schedule.columns.str.lower()
 schedule.to_csv(processed_path + "vaccine_schedule.csv", index=False)
 
-print("✅ Cleaning complete! Clean CSVs saved in data/processed/ (years are now integers)")
+print("✅ Cleaning complete! Clean CSVs saved in data/processed/ (years are now integers, incidence has incidence_per_100k)")
@@ -35,10 +35,21 @@ try:
             disease VARCHAR(50),
             disease_description VARCHAR(255),
             denominator VARCHAR(50),
-            incidence_rate FLOAT
+            incidence_rate FLOAT,
+            incidence_per_100k FLOAT,
+            denominator_population VARCHAR(50)
         );
         """))
 
+        # incidence tables created before normalization lack these columns; add them if missing
+        for col, col_type in [("incidence_per_100k", "FLOAT"), ("denominator_population", "VARCHAR(50)")]:
+            exists = conn.execute(text("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = :db AND table_name = 'incidence' AND column_name = :col
+            """), {"db": database, "col": col}).scalar()
+            if not exists:
+                conn.execute(text(f"ALTER TABLE incidence ADD COLUMN {col} {col_type}"))
+
         # --- reported_cases table ---
         conn.execute(text("""
         CREATE TABLE IF NOT EXISTS reported_cases (
@@ -1,10 +1,12 @@
 # scripts/eda_cleaned.py
-import os, re
+import os
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
+from bootstrap_corr import bootstrap_corr
+from outliers import detect_anomalies
 
 os.makedirs("outputs/eda_cleaned_plots", exist_ok=True)
 
@@ -26,39 +28,19 @@ coverage_clean.loc[:, 'target_number'] = pd.to_numeric(coverage_clean['target_nu
 coverage_clean = coverage_clean[(coverage_clean['doses'].isna()) | (coverage_clean['doses'] >= 0)]
 coverage_clean = coverage_clean[(coverage_clean['target_number'].isna()) | (coverage_clean['target_number'] >= 0)]
 
-# 2) Flag/clean coverage outliers
+# 2) Coverage to numeric; out-of-range values are reported in the anomaly table below
 coverage_clean.loc[:, 'coverage'] = pd.to_numeric(coverage_clean['coverage'], errors='coerce')
-# Keep rows with coverage between 0 and 100 by default; keep >100 but flagged
-coverage_clean['coverage_flag'] = np.where((coverage_clean['coverage'] < 0) | (coverage_clean['coverage'] > 100), 'outlier', 'ok')
 
 # 3) Clean reported cases: convert to numeric, drop negatives
 reported_clean = reported.copy()
 reported_clean['cases'] = pd.to_numeric(reported_clean['cases'], errors='coerce')
 reported_clean = reported_clean[reported_clean['cases'] >= 0]
 
-# 4) Parse incidence denominator and convert incidence_rate to per 100k
+# 4) Incidence: incidence_per_100k is normalized from the denominator in clean_data.py
 inc = incidence.copy()
-inc['incidence_rate'] = pd.to_numeric(inc['incidence_rate'], errors='coerce')
-
-def denom_base(s):
-    if pd.isna(s):
-        return np.nan
-    s = str(s).lower().replace(',', '')
-    m = re.search(r'per\s*([0-9]+)', s)
-    if m:
-        return int(m.group(1))
-    # fallback: common phrases
-    if 'live' in s and 'birth' in s:
-        # typical is per 10,000 live births -> guess 10000
-        m2 = re.search(r'per\s*10', s)
-        return 10000
-    return np.nan
-
-inc['denom_base'] = inc['denominator'].apply(denom_base)
-# convert to per 100k: incidence_per_100k = incidence_rate * (100000 / denom_base)
-inc['incidence_per_100k'] = np.nan
-mask = inc['denom_base'].notna() & inc['incidence_rate'].notna()
-inc.loc[mask, 'incidence_per_100k'] = inc.loc[mask, 'incidence_rate'] * (100000.0 / inc.loc[mask, 'denom_base'])
+inc['incidence_per_100k'] = pd.to_numeric(inc['incidence_per_100k'], errors='coerce')
+# per 100k live births and per 100k population are different units; aggregate the population-based rates
+inc = inc[inc['denominator_population'] == 'total population']
 
 # --- AGGREGATE country-year level (cleaned) ---
 cov_agg = coverage_clean.groupby(['code','year'], as_index=False).agg(
@@ -90,7 +72,10 @@ def corr_with_p(x, y):
         return None
     pear_r, pear_p = stats.pearsonr(df[x], df[y])
     spear_r, spear_p = stats.spearmanr(df[x], df[y])
-    return {'n': len(df), 'pearson_r': pear_r, 'pearson_p': pear_p, 'spearman_r': spear_r, 'spearman_p': spear_p}
+    # seeded bootstrap 95% CIs
+    ci = bootstrap_corr(df[x].to_numpy(), df[y].to_numpy())
+    return {'n': len(df), 'pearson_r': pear_r, 'pearson_p': pear_p, 'spearman_r': spear_r, 'spearman_p': spear_p,
+            'pearson_ci': (ci['pearson_lo'], ci['pearson_hi']), 'spearman_ci': (ci['spearman_lo'], ci['spearman_hi'])}
 
 c1 = corr_with_p('avg_coverage','avg_incidence_per_100k')
 c2 = corr_with_p('avg_coverage','total_cases')
@@ -119,13 +104,11 @@ def scatter(x,y, fname, logy=False):
 scatter('avg_coverage','avg_incidence_per_100k','cov_vs_inc_per100k')
 scatter('avg_coverage','total_cases','cov_vs_cases_log', logy=True)
 
-# --- top problematic rows to inspect ---
-# coverage > 100
-bad_cov = coverage_clean[coverage_clean['coverage_flag']=='outlier'].sort_values('coverage', ascending=False).head(50)
-bad_cov.to_csv("outputs/top_coverage_outliers.csv", index=False)
+# --- anomaly table ---
+# range checks, negative doses/targets and grouped median/MAD outliers, top-k per category,
+# computed on the uncleaned coverage so rows dropped above are still reported
+anomalies = detect_anomalies(coverage)
+anomalies.to_csv("outputs/coverage_anomalies.csv")
+print("\nAnomalies per category:\n", anomalies.groupby(level='category').size())
 
-# negative/huge doses/target numbers
-coverage_clean[coverage_clean['doses'] < 0].to_csv("outputs/negative_doses.csv", index=False)
-coverage_clean[coverage_clean['target_number'] < 0].to_csv("outputs/negative_targets.csv", index=False)
-
-print("\nSaved cleaned summary, plots and outlier lists in outputs/ (see eda_cleaned_summary.csv and eda_cleaned_plots/)")
+print("\nSaved cleaned summary, plots and outlier lists in outputs/ (see eda_cleaned_summary.csv, coverage_anomalies.csv and eda_cleaned_plots/)")
@@ -0,0 +1,156 @@
+# scripts/eda_timeseries.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# ---- paths ----
+proc_dir = "data/processed"
+out_path = "outputs/coverage_timeseries.csv"
+
+# one series per estimate type: ADMIN, OFFICIAL and WUENIC figures are never mixed
+SERIES = ['code', 'antigen', 'coverage_category']
+KEYS = SERIES + ['year']
+WINDOWS = (3, 5)
+SLOPE_WINDOW = 5
+# rows of history each series needs to recompute its newest metrics
+TAIL = max(max(WINDOWS), SLOPE_WINDOW)
+
+
+def build_panel(coverage):
+    """
+    One coverage value per (code, antigen, coverage_category, year), sorted by that key.
+    Each coverage_category is kept as its own series: which categories a country
+    reports changes from year to year, so averaging across them would turn a change
+    in the category mix (or an ADMIN outlier such as 32000%) into a trend.
+    """
+    cov = coverage[KEYS + ['coverage']].copy()
+    cov['coverage'] = pd.to_numeric(cov['coverage'], errors='coerce')
+    cov = cov.dropna(subset=KEYS)
+    cov['year'] = cov['year'].astype(int)
+    panel = cov.groupby(KEYS, as_index=False, sort=True)['coverage'].mean()
+    return panel.reset_index(drop=True)
+
+
+def _window_sum(values, pos, w):
+    """Trailing sum over the last w rows of each series (NaN until w rows exist)."""
+    cs = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(len(values))
+    out = cs[idx + 1] - cs[np.maximum(idx + 1 - w, 0)]
+    return np.where(pos >= w - 1, out, np.nan)
+
+
+def _spans_years(years, pos, w):
+    """True where the last w rows of a series cover w consecutive years."""
+    start = years[np.maximum(np.arange(len(years)) - (w - 1), 0)]
+    return (pos >= w - 1) & (years - start == w - 1)
+
+
+def compute_metrics(panel):
+    """
+    Year-over-year change, rolling means and rolling trend slopes for every series.
+    :param panel: DataFrame sorted by KEYS with a 'coverage' column
+    :return: copy of panel with the metric columns added
+    A metric is NaN unless its window covers consecutive years with no missing
+    coverage value, so a skipped year never gets bridged.
+    """
+    out = panel.reset_index(drop=True).copy()
+    pos = out.groupby(SERIES, sort=False).cumcount().to_numpy()
+
+    y = out['coverage'].to_numpy(dtype=float)
+    present = ~np.isnan(y)
+    y0 = np.where(present, y, 0.0)
+    # slope is shift-invariant in x; offsetting keeps the cumulative sums small
+    years = out['year'].to_numpy(dtype=int)
+    x = (years - (years.min() if len(years) else 0)).astype(float)
+
+    prev = np.concatenate(([np.nan], y[:-1]))
+    out['yoy_change'] = np.where(_spans_years(years, pos, 2), y - prev, np.nan)
+
+    for w in WINDOWS:
+        full = (_window_sum(present.astype(float), pos, w) == w) & _spans_years(years, pos, w)
+        out[f'rolling_mean_{w}'] = np.where(full, _window_sum(y0, pos, w) / w, np.nan)
+
+    w = SLOPE_WINDOW
+    full = (_window_sum(present.astype(float), pos, w) == w) & _spans_years(years, pos, w)
+    sx = _window_sum(x, pos, w)
+    sy = _window_sum(y0, pos, w)
+    sxy = _window_sum(x * y0, pos, w)
+    sxx = _window_sum(x * x, pos, w)
+    denom = w * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (w * sxy - sx * sy) / denom
+    out[f'trend_slope_{w}'] = np.where(full & (denom != 0), slope, np.nan)
+    return out
+
+
+def _in_series(df, series):
+    """Boolean mask of df rows whose SERIES key appears in series."""
+    hit = df[SERIES].merge(series.drop_duplicates(), on=SERIES, how='left', indicator=True)
+    return (hit['_merge'] == 'both').to_numpy()
+
+
+def changed_series(stored, panel):
+    """
+    Series whose already-processed history differs between stored and panel.
+    :return: DataFrame of SERIES keys with a revised, added (backfilled) or removed
+             value in any year up to the last stored year
+    """
+    last_year = stored['year'].max()
+    old = stored[KEYS + ['coverage']]
+    new = panel.loc[panel['year'] <= last_year, KEYS + ['coverage']]
+    both = old.merge(new, on=KEYS, how='outer', suffixes=('_old', '_new'), indicator=True)
+    same = (both['_merge'] == 'both').to_numpy() & np.isclose(
+        both['coverage_old'].to_numpy(dtype=float), both['coverage_new'].to_numpy(dtype=float), equal_nan=True)
+    return both.loc[~same, SERIES].drop_duplicates().reset_index(drop=True)
+
+
+def append_years(stored, panel):
+    """
+    Bring stored metrics up to date with panel, computing only what changed.
+    :param stored: output of compute_metrics for the history already processed
+    :param panel: build_panel rows of the current release (full history)
+    :return: (metrics sorted by KEYS, number of series fully recomputed)
+    Series whose past values were revised or backfilled are recomputed from panel;
+    every other series only gets metrics for years after the stored history.
+    """
+    last_year = stored['year'].max()
+    changed = changed_series(stored, panel)
+    stored = stored[~_in_series(stored, changed)]
+    dirty = _in_series(panel, changed)
+    recomputed = compute_metrics(panel[dirty])
+    new_panel = panel[~dirty & (panel['year'] > last_year).to_numpy()]
+
+    # each series only needs its last TAIL-1 stored observations as context
+    history = stored.merge(new_panel[SERIES].drop_duplicates(), on=SERIES, how='inner')
+    history = history.groupby(SERIES, sort=False).tail(TAIL - 1)
+
+    ctx = pd.concat([history[KEYS + ['coverage']], new_panel[KEYS + ['coverage']]], ignore_index=True)
+    ctx = ctx.sort_values(KEYS, kind='mergesort').reset_index(drop=True)
+    fresh = compute_metrics(ctx)
+    fresh = fresh[fresh['year'] > last_year]
+
+    combined = pd.concat([stored, fresh, recomputed], ignore_index=True)
+    return combined.sort_values(KEYS, kind='mergesort').reset_index(drop=True), len(changed)
+
+
+if __name__ == "__main__":
+    coverage = pd.read_csv(os.path.join(proc_dir, "coverage.csv"))
+    coverage.columns = [c.lower() for c in coverage.columns]
+    panel = build_panel(coverage)
+
+    # pass --full to ignore stored metrics and recompute every series
+    if os.path.exists(out_path) and "--full" not in sys.argv:
+        stored = pd.read_csv(out_path)
+        last_year = stored['year'].max()
+        result, n_changed = append_years(stored, panel)
+        if n_changed:
+            print(f"⚠️ {n_changed} series had revised or backfilled years <= {last_year}; recomputed them in full")
+        print(f"Appended {int((result['year'] > last_year).sum())} new series-year rows (years > {last_year})")
+    else:
+        result = compute_metrics(panel)
+        print(f"Computed metrics for {len(result)} series-year rows")
+
+    os.makedirs("outputs", exist_ok=True)
+    result.to_csv(out_path, index=False)
+    print("Time-series metrics saved to:", out_path)
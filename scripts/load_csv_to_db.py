@@ -40,7 +40,7 @@ load_csv_to_table("data/processed/coverage.csv", "coverage", {
 
 load_csv_to_table("data/processed/incidence.csv", "incidence", {
     "code": 20, "name": 255, "disease": 50, "disease_description": 255,
-    "denominator": 50
+    "denominator": 50, "denominator_population": 50
 })
 
 load_csv_to_table("data/processed/reported_cases.csv", "reported_cases", {
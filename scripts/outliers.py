@@ -0,0 +1,79 @@
+# scripts/outliers.py
+import numpy as np
+import pandas as pd
+
+# robust z = 0.6745 * (x - median) / MAD; 3.5 is the usual Iglewicz-Hoaglin cut-off
+MAD_SCALE = 0.6745
+Z_THRESHOLD = 3.5
+TOP_K = 50
+
+ID_COLS = ['code', 'name', 'year', 'antigen', 'coverage_category']
+VALUE_COLS = ['coverage', 'doses', 'target_number']
+
+
+def robust_z(values, groups):
+    """
+    Robust z-score of each value against the median/MAD of its group.
+    :param values: numeric Series
+    :param groups: Series or list of Series aligned with values, used as groupby keys
+    Groups with MAD == 0 get NaN scores rather than infinite ones.
+    """
+    g = values.groupby(groups, sort=False)
+    med = g.transform('median')
+    dev = (values - med).abs()
+    mad = dev.groupby(groups, sort=False).transform('median')
+    return (MAD_SCALE * (values - med) / mad.where(mad > 0)).astype(float)
+
+
+def top_k(scores, k=TOP_K):
+    """Index labels of the k largest scores (descending), via partial selection."""
+    scores = scores.dropna()
+    if len(scores) <= k:
+        return scores.sort_values(ascending=False).index
+    arr = scores.to_numpy()
+    part = np.argpartition(arr, -k)[-k:]
+    part = part[np.argsort(-arr[part], kind='stable')]
+    return scores.index[part]
+
+
+def detect_anomalies(coverage, k=TOP_K):
+    """
+    Build one anomaly table covering every category of suspicious coverage row.
+    :param coverage: lowercase coverage DataFrame (before any negative filtering)
+    :param k: rows kept per category, ranked by severity score
+    :return: DataFrame indexed by (category, row_id), row_id being coverage's index
+    Categories: coverage_out_of_range, negative_doses, negative_target,
+    robust_antigen (vs. all years/countries of the antigen) and robust_country
+    (vs. the same country and antigen across years).
+    """
+    cov = coverage.copy()
+    for col in VALUE_COLS:
+        cov[col] = pd.to_numeric(cov[col], errors='coerce')
+    c = cov['coverage']
+
+    z_antigen = robust_z(c, cov['antigen'])
+    z_country = robust_z(c, [cov['code'], cov['antigen']])
+
+    # severity score per category; NaN means "not in this category"
+    scores = {
+        'coverage_out_of_range': (c - 100).clip(lower=0).where(c > 100, (-c).where(c < 0)),
+        'negative_doses': (-cov['doses']).where(cov['doses'] < 0),
+        'negative_target': (-cov['target_number']).where(cov['target_number'] < 0),
+        'robust_antigen': z_antigen.abs().where(z_antigen.abs() > Z_THRESHOLD),
+        'robust_country': z_country.abs().where(z_country.abs() > Z_THRESHOLD),
+    }
+
+    cols = [col for col in ID_COLS + VALUE_COLS if col in cov.columns]
+    parts = []
+    for category, score in scores.items():
+        idx = top_k(score, k)
+        part = cov.loc[idx, cols].copy()
+        part.insert(0, 'category', category)
+        part.insert(1, 'row_id', idx)
+        part['score'] = score.loc[idx].to_numpy()
+        part['robust_z_antigen'] = z_antigen.loc[idx].to_numpy()
+        part['robust_z_country'] = z_country.loc[idx].to_numpy()
+        parts.append(part)
+
+    anomalies = pd.concat(parts, ignore_index=True)
+    return anomalies.set_index(['category', 'row_id'])